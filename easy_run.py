@@ -1,27 +1,41 @@
 # -*- coding: utf-8 -*-
 # Import Libraries
+import asyncio
+import io
+import itertools
+import sys
+import aiohttp
 import requests
 import re
-import json
+import orjson
 from todoist_api_python.api import TodoistAPI
 from requests.auth import HTTPDigestAuth
 from datetime import datetime, timezone, timedelta
+from email.utils import parsedate_to_datetime
 import time
-from random import randint
+from random import randint, random
 
 # Load configuration files and creates a list of course_ids
 config = {}
 header = {}
+canvas_session = requests.Session()  # Shared connection pool for synchronous Canvas requests
 param = {"per_page": "100", "include": "submission", "enrollment_state": "active"}
 course_ids = []
 assignments = []
 todoist_tasks = []
+todoist_task_index = {}
 courses_id_name_dict = {}
 todoist_project_dict = {}
 throttle_number = 50  # Number of requests to make before sleeping for delay seconds
 sleep_delay_max = 2500  # Maximum number of milliseconds to sleep for
 max_added = 250  # Maximum number of assignments to add to Todoist at once. Todoist API limit is 450 requests per 15 minutes and you can quickly hit this if adding a massive number of assignments.
+max_concurrent_requests = 16  # Maximum number of Canvas requests in flight at once
+max_retries = 3  # Number of times to retry a throttled or failed Canvas request
+retryable_statuses = (429, 500, 502, 503, 504)
+rate_limit_floor = 50  # Slow down once Canvas reports less than this much rate limit quota remaining
 limit_reached = False  # Global var used to terminate early if limit is reached or API returns an error.
+null_submission_types = ("not_graded", "none", "on_paper")  # Submission types treated as ungraded/non-submittable
+course_name_pattern = re.compile(r"[^-a-zA-Z0-9._\s]")  # Characters stripped from course names
 
 
 def main():
@@ -56,8 +70,8 @@ def initialize_api():
     global todoist_api
 
     try:
-        with open("config.json") as config_file:
-            config = json.load(config_file)
+        with open("config.json", "rb") as config_file:
+            config = orjson.loads(config_file.read())
     except FileNotFoundError:
         print("File not Found, running Initial Configuration")
         initial_config()
@@ -120,8 +134,13 @@ def initial_config():  # Initial configuration for first time users
             config["sync_locked_assignments"] = True
             config["sync_no_due_date_assignments"] = True
     config["courses"] = []
-    with open("config.json", "w") as outfile:
-        json.dump(config, outfile)
+    save_config()
+
+
+# Writes the current configuration to config.json
+def save_config():
+    with open("config.json", "wb") as outfile:
+        outfile.write(orjson.dumps(config, option=orjson.OPT_INDENT_2))
 
 
 # Allows the user to select the courses that they want to transfer while generating a dictionary
@@ -131,8 +150,48 @@ def initial_config():  # Initial configuration for first time users
 def select_courses():
     global config
 
+    if config["courses"]:
+        use_previous_input = input(
+            "You have previously selected courses. Would you like to use the courses selected last time? (y/n) "
+        )
+        print("")
+        if use_previous_input == "y" or use_previous_input == "Y":
+            course_ids.extend(
+                list(map(lambda course_id: int(course_id), config["courses"]))
+            )
+            # Course names are saved with the selection, so Canvas only needs to
+            # be queried for configs written before they were stored
+            course_names = config.get("course_names", {})
+            if all(str(course_id) in course_names for course_id in course_ids):
+                for course_id in course_ids:
+                    courses_id_name_dict[course_id] = course_names[str(course_id)]
+                return
+            for course in load_courses():
+                courses_id_name_dict[course["id"]] = clean_course_name(course["name"])
+            save_course_selection()
+            return
+
+    # If the user does not choose to use courses selected last time
+    courses = load_courses()
+    for i, course in enumerate(courses, start=1):
+        courses_id_name_dict[course["id"]] = clean_course_name(course["name"])
+        print(f"{i} ) {courses_id_name_dict[course['id']]} : {course['id']}")
+
+    print(
+        "\nEnter the courses you would like to add to Todoist by entering the numbers of the items you would like to select. Separate numbers with spaces."
+    )
+    my_input = input(">")
+    input_array = my_input.split()
+    course_ids.extend(
+        list(map(lambda item: courses[int(item) - 1]["id"], input_array))
+    )
+    save_course_selection()
+
+
+# Loads the user's courses from Canvas
+def load_courses():
     try:
-        response = requests.get(
+        response = canvas_session.get(
             f"{config['canvas_api_heading']}/api/v1/courses",
             headers=header,
             params=param,
@@ -141,78 +200,45 @@ def select_courses():
             print("Unauthorized; Check API Key")
             exit()
         # Note that only courses in "Active" state are returned
-        if config["courses"]:
-            use_previous_input = input(
-                "You have previously selected courses. Would you like to use the courses selected last time? (y/n) "
-            )
-            print("")
-            if use_previous_input == "y" or use_previous_input == "Y":
-                course_ids.extend(
-                    list(map(lambda course_id: int(course_id), config["courses"]))
-                )
-                for course in response.json():
-                    courses_id_name_dict[course.get("id", None)] = re.sub(
-                        r"[^-a-zA-Z0-9._\s]", "", course.get("name", "")
-                    )
-                return
+        courses = response.json()
+        while "next" in response.links:
+            sleep()  # Throttle requests to Canvas API to prevent rate limiting on multiple pages
+            response = canvas_session.get(response.links["next"]["url"], headers=header)
+            courses.extend(response.json())
+        # Courses the user can no longer access are returned without a name
+        return [course for course in courses if course.get("name") is not None]
     except Exception as error:
         print(f"Error while loading courses: {error}")
         print(f"Check API Key and Canvas URL")
         exit()
 
-    # If the user does not choose to use courses selected last time
-    for i, course in enumerate(response.json(), start=1):
-        courses_id_name_dict[course.get("id", None)] = re.sub(
-            r"[^-a-zA-Z0-9._\s]", "", course.get("name", "")
-        )
-        if course.get("name") is not None:
-            print(
-                f"{str(i)} ) {courses_id_name_dict[course.get('id', '')]} : {str(course.get('id', ''))}"
-            )
-
-    print(
-        "\nEnter the courses you would like to add to Todoist by entering the numbers of the items you would like to select. Separate numbers with spaces."
-    )
-    my_input = input(">")
-    input_array = my_input.split()
-    course_ids.extend(
-        list(
-            map(
-                lambda item: response.json()[int(item) - 1].get("id", None), input_array
-            )
-        )
-    )
 
-    # write course ids to config.json
+# Writes the selected course ids and their names to config.json
+def save_course_selection():
     config["courses"] = course_ids
-    with open("config.json", "w") as outfile:
-        json.dump(config, outfile)
+    config["course_names"] = {
+        str(course_id): courses_id_name_dict[course_id]
+        for course_id in course_ids
+        if course_id in courses_id_name_dict
+    }
+    save_config()
+
+
+# Strips characters that are not allowed in Todoist project names
+def clean_course_name(name):
+    return course_name_pattern.sub("", name)
 
 
 # Iterates over the course_ids list and loads all of the users assignments
 # for those classes. Appends assignment objects to assignments list
 def load_assignments():
     try:
-        for course_id in course_ids:
-            response = requests.get(
-                f"{config['canvas_api_heading']}/api/v1/courses/{str(course_id)}/assignments",
-                headers=header,
-                params=param,
-            )
-            if response.status_code == 401:
-                print("Unauthorized; Check API Key")
-                exit()
-            paginated = response.json()
-            while "next" in response.links:
-                sleep()  # Throttle requests to Canvas API to prevent rate limiting on multiple pages
-                response = requests.get(
-                    response.links["next"]["url"], headers=header, params=param
-                )
-                paginated.extend(response.json())
+        results = asyncio.run(fetch_all_assignments())
+        for course_id, paginated in zip(course_ids, results):
             print(
                 f"Loaded {len(paginated)} Assignments for Course {courses_id_name_dict[course_id]}"
             )
-            assignments.extend(paginated)
+        assignments.extend(itertools.chain.from_iterable(results))
         print(f"Loaded {len(assignments)} Total Canvas Assignments")
         return
     except Exception as error:
@@ -221,31 +247,137 @@ def load_assignments():
         exit()
 
 
+# Fetches the assignments for every selected course concurrently, returning
+# one list of assignments per course in the same order as course_ids
+async def fetch_all_assignments():
+    courses_url = f"{config['canvas_api_heading']}/api/v1/courses"
+    # Created here rather than at import so it binds to the running event loop
+    semaphore = asyncio.Semaphore(max_concurrent_requests)
+    connector = aiohttp.TCPConnector(limit_per_host=64)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [
+            fetch_course_assignments(
+                session, semaphore, f"{courses_url}/{course_id}/assignments"
+            )
+            for course_id in course_ids
+        ]
+        return await asyncio.gather(*tasks)
+
+
+# Loads every page of assignments for a single course
+async def fetch_course_assignments(session, semaphore, url):
+    params = param
+    paginated = []
+    while True:
+        page, next_link = await fetch_page(session, semaphore, url, params)
+        paginated.extend(page)
+        if next_link is None:
+            break
+        # The next link already carries the query parameters
+        url = next_link["url"]
+        params = None
+        await async_sleep()  # Throttle requests to Canvas API to prevent rate limiting on multiple pages
+    return paginated
+
+
+# Fetches a single page from the Canvas API, retrying with exponential backoff
+# when Canvas throttles the request, returns a transient server error or the
+# connection fails
+async def fetch_page(session, semaphore, url, params):
+    for attempt in range(max_retries + 1):
+        retry_after = 0
+        try:
+            async with semaphore:
+                async with session.get(url, headers=header, params=params) as response:
+                    if response.status == 401:
+                        raise PermissionError("Unauthorized; Check API Key")
+                    if attempt < max_retries and await is_throttled(response):
+                        reason = f"Canvas returned {response.status}"
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After")
+                        )
+                    else:
+                        response.raise_for_status()
+                        # Back off before the bucket runs dry rather than waiting for a 429
+                        remaining = response.headers.get("X-Rate-Limit-Remaining")
+                        if remaining is not None and float(remaining) < rate_limit_floor:
+                            await async_sleep()
+                        return await response.json(), response.links.get("next")
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+            if attempt == max_retries:
+                raise
+            reason = f"Canvas request failed ({str(error) or type(error).__name__})"
+        delay = max(retry_after, min(30, 2**attempt + random()))
+        print(f"{reason}, retrying in {delay:.1f} seconds...")
+        await asyncio.sleep(delay)
+
+
+# Checks whether a Canvas response is a transient failure worth retrying.
+# Canvas rejects over-limit requests with 403 Forbidden (Rate Limit Exceeded),
+# so a 403 is only retried when it is a throttle rather than a real auth failure
+async def is_throttled(response):
+    if response.status in retryable_statuses:
+        return True
+    if response.status != 403:
+        return False
+    remaining = response.headers.get("X-Rate-Limit-Remaining")
+    if remaining is not None and float(remaining) <= 0:
+        return True
+    return "rate limit exceeded" in (await response.text()).lower()
+
+
+# Returns the number of seconds a Retry-After header asks us to wait. The header
+# may be given in seconds or as an HTTP-date; anything unparseable counts as 0 so
+# the caller falls back to its backoff delay
+def parse_retry_after(value):
+    if value is None:
+        return 0
+    try:
+        return max(0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return 0
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
 # Loads all user tasks from Todoist
 def load_todoist_tasks():
     tasks = todoist_api.get_tasks()
     todoist_tasks.extend(tasks)
+    # Index tasks by project and content so assignments can be matched with a
+    # single lookup; keep the first task when duplicates exist
+    for task in tasks:
+        todoist_task_index.setdefault((task.project_id, task.content), task)
     print(f"Loaded {len(todoist_tasks)} Todoist Tasks")
 
 
 # Loads all user projects from Todoist
 def load_todoist_projects():
     projects = todoist_api.get_projects()
-    for project in projects:
-        todoist_project_dict[project.name] = project.id
+    todoist_project_dict.update({project.name: project.id for project in projects})
     print(f"Loaded {len(todoist_project_dict)} Todoist Projects")
 
 
 # Checks to see if the user has a project matching their course names, if there
 # is not a new project will be created
 def create_todoist_projects():
+    new_project_names = []
     for course_id in course_ids:
-        if courses_id_name_dict[course_id] not in todoist_project_dict:
-            project = todoist_api.add_project(courses_id_name_dict[course_id])
-            print(f"Project {courses_id_name_dict[course_id]} created")
-            todoist_project_dict[project.name] = project.id
-        else:
-            print(f"Project {courses_id_name_dict[course_id]} exists")
+        course_name = courses_id_name_dict[course_id]
+        if course_name in todoist_project_dict:
+            print(f"Project {course_name} exists")
+        elif course_name not in new_project_names:
+            new_project_names.append(course_name)
+    # The REST API has no batch endpoint, so create projects one at a time in course order
+    for course_name in new_project_names:
+        project = todoist_api.add_project(course_name)
+        print(f"Project {project.name} created")
+        todoist_project_dict[project.name] = project.id
 
 
 # Transfers over assignments from canvas over to Todoist, the method Checks
@@ -258,146 +390,160 @@ def transfer_assignments_to_todoist():
     global limit_reached
     global throttle_number
     request_count = 0
-    for assignment in assignments:
-        course_name = courses_id_name_dict[assignment["course_id"]]
-        project_id = todoist_project_dict[course_name]
+    # Buffer per-assignment output and write it out in one go
+    log = io.StringIO()
+    # Assignments unlocking after this cutoff are treated as locked
+    unlock_cutoff = (datetime.now() + timedelta(days=3)).isoformat()
+    # Resolve each course's Todoist project once rather than per assignment
+    course_project_dict = {
+        course_id: todoist_project_dict[courses_id_name_dict[course_id]]
+        for course_id in course_ids
+    }
+    try:
+        for assignment in assignments:
+            course_name = courses_id_name_dict[assignment["course_id"]]
+            project_id = course_project_dict[assignment["course_id"]]
+            title = make_task_title(assignment)
 
-        is_added = False
-        is_synced = True
+            is_added, is_synced, task = check_existing_task(
+                title, project_id, assignment
+            )
 
-        for task in todoist_tasks:
-            # Check if assignment is already added to Todoist with same name and within the same Project
-            if (
-                task.content == f"[{assignment['name']}]({assignment['html_url']}) Due"
-                and task.project_id == project_id
-            ):
-                is_added = True
-                # Ignore updates if assignment has no due date and already synced
-                if assignment["due_at"] is None:
-                    break
-                # Handle case where task does not have due date but assignment does
-                if task.due is None and assignment["due_at"] is not None:
-                    is_synced = False
-                    print(
-                        f"Updating assignment due date: {course_name}:{assignment['name']} to {str(assignment['due_at'])}"
-                    )
-                    update_task(assignment, task)
-                    request_count += 1
-                    break
-                # Check for existence of task.due first to prevent error
-                if task.due is not None:
-                    # Handle case where assignment and task both have due dates but they are different
-                    if assignment["due_at"] != task.due.datetime:
-                        is_synced = False
-                        print(
-                            f"Updating assignment due date: {course_name}:{assignment['name']} to {str(assignment['due_at'])}"
-                        )
-                        update_task(assignment, task)
-                        request_count += 1
-                        break
-
-            # Handle case where assignment is not graded
-            if config["sync_null_assignments"] == False:
-                ## This is hacky, but it works for now - need to fix this
-                if (
-                    assignment["submission_types"][0] == "not_graded"
-                    or assignment["submission_types"][0] == "none"
-                    or assignment["submission_types"][0] == "on_paper"
-                ):
-                    print(
-                        f"Excluding ungraded/non-submittable assignment: {course_name}: {assignment['name']}"
-                    )
-                    is_added = True
-                    excluded += 1
-                    break
-            # Handle case where assignment has no due date and user has specified to not sync assignments with no due date
-            if (
-                assignment["due_at"] is None
-                and config["sync_no_due_date_assignments"] == False
-            ):
-                print(
-                    f"Excluding assignment with no due date: {course_name}: {assignment['name']}"
-                )
-                excluded += 1
-                is_added = True
-                break
-            # Handle case where assignment is locked and unlock date is more than 2 days in the future
-            if (
-                assignment["unlock_at"] is not None
-                and config["sync_locked_assignments"] == False
-                and assignment["unlock_at"]
-                > (datetime.now() + timedelta(days=3)).isoformat()
-            ):
-                print(
-                    f"Excluding assignment that is not yet unlocked: {course_name}: {assignment['name']}: {assignment['lock_explanation']}"
+            if is_added and not is_synced:
+                log.write(
+                    f"Updating assignment due date: {course_name}:{assignment['name']} to {assignment['due_at']}\n"
                 )
-                is_added = True
-                excluded += 1
-                break
-            # Handle case where assignment is locked and unlock date is empty
-            if (
-                assignment["locked_for_user"] == True
-                and assignment["unlock_at"] is None
-                and config["sync_locked_assignments"] == False
+                update_task(assignment, task, log)
+                request_count += 1
+            elif not is_added and is_excluded(
+                assignment, course_name, unlock_cutoff, log
             ):
-                print(
-                    f"Excluding assignment that is locked: {course_name}: {assignment['name']}: {assignment['lock_explanation']}"
-                )
-                is_added = True
                 excluded += 1
+            # Add assignment to Todoist if not already added - Ignore assignments that are already submitted
+            elif not is_added:
+                if assignment["submission"]["workflow_state"] == "unsubmitted":
+                    log.write(
+                        f"Adding assignment {course_name}: {assignment['name']}\n"
+                    )
+                    add_new_task(assignment, project_id, log)
+                    new_added += 1
+                    request_count += 1
+            # Update count of updated assignments (updated due date - already updated in Todoist)
+            if is_added and not is_synced:
+                updated += 1
+            # Update count of already synced assignments (already synced to Todoist, no updates)
+            if is_synced and is_added:
+                already_synced += 1
+            if new_added > max_added:
+                limit_reached = True
+            if limit_reached:
                 break
-        # Add assignment to Todoist if not already added - Ignore assignments that are already submitted
-        if not is_added:
-            if assignment["submission"]["workflow_state"] == "unsubmitted":
-                print(f"Adding assignment {course_name}: {assignment['name']}")
-                add_new_task(assignment, project_id)
-                new_added += 1
-                request_count += 1
-        # Update count of updated assignments (updated due date - already updated in Todoist)
-        if is_added and not is_synced:
-            updated += 1
-        # Update count of already synced assignments (already synced to Todoist, no updates)
-        if is_synced and is_added:
-            already_synced += 1
-        if new_added > max_added:
-            limit_reached = True
-        if limit_reached:
-            break
-        # Throttle requests to Todoist API to prevent rate limiting, sleep every 50 requests
-        if request_count % throttle_number == 0 and request_count > 1:
-            print(f"Current request count: {request_count}")
-            sleep()
+            # Throttle requests to Todoist API to prevent rate limiting, sleep every 50 requests
+            if request_count % throttle_number == 0 and request_count > 1:
+                log.write(f"Current request count: {request_count}\n")
+                # Flush before sleeping so progress stays visible during long syncs
+                flush_log(log)
+                sleep()
+    finally:
+        # Report what was already added or updated even if the sync is interrupted
+        flush_log(log)
     if limit_reached:
-        print(
-            f"Reached Todoist API or configured limit. Not all tasks added. Please try again in 15 minutes."
+        log.write(
+            f"Reached Todoist API or configured limit. Not all tasks added. Please try again in 15 minutes.\n"
         )
-    print(f"  {'-'*52}")
-    print(f"Added to Todoist: {new_added}")
-    print(f"Due Date Updated In Todoist: {updated}")
-    print(f"Already Synced to Todoist: {already_synced}")
-    print(f"Excluded: {excluded}")
+    log.write(f"  {'-'*52}\n")
+    log.write(f"Added to Todoist: {new_added}\n")
+    log.write(f"Due Date Updated In Todoist: {updated}\n")
+    log.write(f"Already Synced to Todoist: {already_synced}\n")
+    log.write(f"Excluded: {excluded}\n")
+    flush_log(log)
+
+
+# Builds the Todoist task content used to match assignments to existing tasks
+def make_task_title(assignment):
+    return f"[{assignment['name']}]({assignment['html_url']}) Due"
+
+
+# Looks up the Todoist task for an assignment by project and task title.
+# Returns whether the task exists, whether its due date is in sync, and the task
+def check_existing_task(title, project_id, assignment):
+    task = todoist_task_index.get((project_id, title))
+    if task is None:
+        return False, True, None
+    return True, synced_check(task, assignment), task
+
+
+# Checks whether an existing task's due date matches the assignment's due date
+def synced_check(task, assignment):
+    # Ignore updates if assignment has no due date and already synced
+    if assignment["due_at"] is None:
+        return True
+    # Handle case where task does not have due date but assignment does
+    if task.due is None:
+        return False
+    # Handle case where assignment and task both have due dates but they are different
+    return assignment["due_at"] == task.due.datetime
+
+
+# Checks the user's sync options to see if an assignment that is not yet in
+# Todoist should be skipped, logging the reason if it is
+def is_excluded(assignment, course_name, unlock_cutoff, log):
+    # Handle case where assignment is not graded
+    if config["sync_null_assignments"] == False:
+        ## This is hacky, but it works for now - need to fix this
+        if assignment["submission_types"][0] in null_submission_types:
+            log.write(
+                f"Excluding ungraded/non-submittable assignment: {course_name}: {assignment['name']}\n"
+            )
+            return True
+    # Handle case where assignment has no due date and user has specified to not sync assignments with no due date
+    if (
+        assignment["due_at"] is None
+        and config["sync_no_due_date_assignments"] == False
+    ):
+        log.write(
+            f"Excluding assignment with no due date: {course_name}: {assignment['name']}\n"
+        )
+        return True
+    # Handle case where assignment is locked and unlock date is more than 2 days in the future
+    if (
+        assignment["unlock_at"] is not None
+        and config["sync_locked_assignments"] == False
+        and assignment["unlock_at"] > unlock_cutoff
+    ):
+        log.write(
+            f"Excluding assignment that is not yet unlocked: {course_name}: {assignment['name']}: {assignment['lock_explanation']}\n"
+        )
+        return True
+    # Handle case where assignment is locked and unlock date is empty
+    if (
+        assignment["locked_for_user"] == True
+        and assignment["unlock_at"] is None
+        and config["sync_locked_assignments"] == False
+    ):
+        log.write(
+            f"Excluding assignment that is locked: {course_name}: {assignment['name']}: {assignment['lock_explanation']}\n"
+        )
+        return True
+    return False
 
 
 # Adds a new task from a Canvas assignment object to Todoist under the
-# project corresponding to project_id
-def add_new_task(assignment, project_id):
+# project corresponding to project_id. Errors are written to the transfer log
+# so they follow the message for the assignment that caused them
+def add_new_task(assignment, project_id, log):
     global limit_reached
     try:
         todoist_api.add_task(
-            content="["
-            + assignment["name"]
-            + "]("
-            + assignment["html_url"]
-            + ")"
-            + " Due",
+            content=make_task_title(assignment),
             project_id=project_id,
             due_datetime=assignment["due_at"],
             labels=config["todoist_task_labels"],
             priority=config["todoist_task_priority"],
         )
     except Exception as error:
-        print(
-            f"Error while adding task: {error}, likely due to rate limiting. Try again in 15 minutes"
+        log.write(
+            f"Error while adding task: {error}, likely due to rate limiting. Try again in 15 minutes\n"
         )
         limit_reached = True
 
@@ -406,19 +552,21 @@ def canvas_assignment_stats():
     print(f"  {'-'*52}")
     print(" #     Current Canvas Assignment Statistics     #")
     print(f"Total Assignments: {len(assignments)}")
-    graded_timestamps = []
+    graded = 0
+    latest_update = None
     submitted = 0
     ignored_not_graded = 0
     ignored_no_submission = 0
     locked = 0
     instructor_graded = 0
     for assignment in assignments:
-        # Check for assignment graded_at dates, and if graded_at is not None, add to graded_timestamps list to report most recent grade update
-        if assignment["submission"]["graded_at"] is not None:
-            timestamp = datetime.strptime(
-                (assignment["submission"]["graded_at"]), "%Y-%m-%dT%H:%M:%SZ"
-            )
-            graded_timestamps.append(timestamp)
+        # Count graded assignments and track the most recent graded_at date to report the latest grade update.
+        # Canvas timestamps are UTC ISO 8601 strings, so they compare in date order without parsing
+        graded_at = assignment["submission"]["graded_at"]
+        if graded_at is not None:
+            graded += 1
+            if latest_update is None or graded_at > latest_update:
+                latest_update = graded_at
         if assignment["graded_submissions_exist"] == True:
             instructor_graded += 1
         if assignment["submission"]["workflow_state"] != "unsubmitted":
@@ -438,20 +586,20 @@ def canvas_assignment_stats():
         f"Remaining (unlocked) Assignments: {(len(assignments)-submitted-ignored_not_graded-ignored_no_submission-locked)}"
     )
     print(f"\n Grading Statistics:")
-    print(f"Total Currently Graded: {max(instructor_graded,len(graded_timestamps))}")
-    latest_update = max(graded_timestamps, default=0)
-    if latest_update == 0:
+    print(f"Total Currently Graded: {max(instructor_graded,graded)}")
+    if latest_update is None:
         print(f"Last Grade Update: Never")
     else:
-        print(f"Last Grade Update: {aslocaltimestr(latest_update)}")
+        timestamp = datetime.strptime(latest_update, "%Y-%m-%dT%H:%M:%SZ")
+        print(f"Last Grade Update: {aslocaltimestr(timestamp)}")
 
 
-def update_task(assignment, task):
+def update_task(assignment, task, log):
     global limit_reached
     try:
         todoist_api.update_task(task_id=task.id, due_datetime=assignment["due_at"])
     except Exception as error:
-        print(f"Error while updating task: {error}")
+        log.write(f"Error while updating task: {error}\n")
         limit_reached = True
 
 
@@ -465,6 +613,14 @@ def aslocaltimestr(utc_dt):
     return utc_to_local(utc_dt).strftime("%Y-%m-%d %I:%M%p")
 
 
+# Writes buffered output to stdout in a single call and resets the buffer
+def flush_log(log):
+    sys.stdout.write(log.getvalue())
+    sys.stdout.flush()
+    log.seek(0)
+    log.truncate()
+
+
 # Function for throttling/sleeping
 def sleep():
     delay = (
@@ -474,5 +630,11 @@ def sleep():
     time.sleep(delay)
 
 
+# Non-blocking variant of sleep() for use inside coroutines
+async def async_sleep():
+    delay = randint(100, sleep_delay_max) / 1000
+    await asyncio.sleep(delay)
+
+
 if __name__ == "__main__":
     main()